@@ -4,6 +4,26 @@ const color = require("../public/colors.js");
 const canvasCommons = require("../public/canvas_commons.js");
 const assert = require("assert");
 
+/**
+ * Redis clients shared by every RedisManager in this process, keyed by the address of the Redis server. A client
+ * pipelines all of its commands over a single connection, so creating one per RedisManager would only open extra
+ * sockets and repeat the connection handshake.
+ */
+const redisClients = new Map();
+
+/**
+ * Gets the Redis client connected to the server specified in the given configuration, creating it if it does not
+ * exist yet.
+ * @param config The configuration of the Redis client, which must contain the host and port of the server.
+ * @returns {RedisClient} The Redis client shared by every RedisManager accessing that server.
+ */
+function getRedisClient(config) {
+    const address = config.host + ":" + config.port;
+    if (!redisClients.has(address)) {
+        redisClients.set(address, redis.createClient(config));
+    }
+    return redisClients.get(address);
+}
 
 class RedisManager {
 
@@ -11,16 +31,23 @@ class RedisManager {
      * Constructs a RedisManager object. RedisManager forms a connection to a local Redis server (which must already be
      * running) via the address and port number specified in commons.REDIS_CONFIG_FILE. To simplify this use case, each
      * RedisManager object can only handle one object in Redis, specified with the 'key' argument. Should a separate
-     * object need to be accessed, a separate RedisManager object should be created for that object instead.
+     * object need to be accessed, a separate RedisManager object should be created for that object instead. All
+     * RedisManager objects accessing the same server share a single connection.
      * @param key The key name of the object to be accessed via this RedisManager object.
+     * @param redisClient The Redis client to use instead of the shared one (e.g. a stubbed client, for testing).
      */
-    constructor(key) {
+    constructor(key, redisClient = getRedisClient(commons.REDIS_CONFIG_FILE)) {
         this.key = key;
+        // The key is converted to a Buffer once, and this Buffer is used by every command sent to Redis.
+        this.keyBuffer = Buffer.from(key);
+        this.offsetCache = null;
+        this.localCanvas = null;
+        this.dirtyBytes = null;
         // this.redisClient = redis.createClient({
         //     config: commons.REDIS_CONFIG_FILE,
         //     retry_strategy: commons.RETRY_STRATEGY_FUNCTION
         // });
-        this.redisClient = redis.createClient(commons.REDIS_CONFIG_FILE);
+        this.redisClient = redisClient;
         console.log("Redis Manager initialized.")
     }
 
@@ -35,23 +62,37 @@ class RedisManager {
      * @param canvas_width The width of the Canvas to be created, in pixels.
      * @param canvas_height The height of the Canvas to be created, in pixels.
      * @param pixel_format The format (e.g. 8-bit unsigned integer) of each pixel.
+     * @returns {Promise<unknown>} A Promise which resolves once the Canvas has been initialized, and is rejected if any
+     * of the commands initializing it fails.
      */
     initializeBlankCanvas(canvas_width, canvas_height, pixel_format) {
         this.width = canvas_width;
         this.height = canvas_height;
+        this.offsetCache = null;
+        this.localCanvas = null;
+        this.dirtyBytes = null;
         this.format = pixel_format;
-        this.setAreaValue(1, 1, this.width, this.height, color.ColorBinary.WHITE);
+        const parsedFormat = commons.parsePixelFormat(pixel_format);
+        this.bitsPerPixel = parsedFormat.bitsPerPixel;
+        this.isSigned = parsedFormat.isSigned;
+        this.pixelMask = 2 ** this.bitsPerPixel - 1;
+        // Pixels are byte-aligned if a whole number of them fits in a byte, or if each of them spans whole bytes.
+        this.isByteAligned = 8 % this.bitsPerPixel === 0 || this.bitsPerPixel % 8 === 0;
+
+        const initializations = [this.fill(color.ColorBinary.WHITE)];
 
         const interval = canvasCommons.INTERVAL_BETWEEN_HELPER_LINES;
         assert(interval > 0, "Interval between helper lines is negative or zero.")
 
         for (let i = interval; i < this.width + 1; i += interval) {
-            this.setAreaValue(i, 1, i, this.height, color.ColorBinary.GREY);
+            initializations.push(this.setAreaValue(i, 1, i, this.height, color.ColorBinary.GREY));
         }
         for (let i = interval; i < this.height + 1; i += interval) {
-            this.setAreaValue(1, i, this.width, i, color.ColorBinary.GREY);
+            initializations.push(this.setAreaValue(1, i, this.width, i, color.ColorBinary.GREY));
         }
-        console.log("Redis Canvas initialized to zeroes with height " + this.height + " and width " + this.width);
+        return Promise.all(initializations).then(() => {
+            console.log("Redis Canvas initialized to zeroes with height " + this.height + " and width " + this.width);
+        });
     }
 
     /**
@@ -63,8 +104,46 @@ class RedisManager {
      * @param pixelYCoordinate The y-coordinate of the pixel to set, which must be specified as 1-based.
      */
     getValue(pixelXCoordinate, pixelYCoordinate) {
+        if (this.bitsPerPixel % 8 === 0) {
+            // Pixels spanning whole bytes are read directly by their byte range, without going through BITFIELD.
+            const bytesPerPixel = this.bitsPerPixel / 8;
+            const byteOffset = ((pixelYCoordinate - 1) * this.width + pixelXCoordinate - 1) * bytesPerPixel;
+            this.redisClient.getrange(this.keyBuffer, byteOffset, byteOffset + bytesPerPixel - 1, (err, result) => {
+                redis.print(err, err ? result : this.readPixel(result, 0));
+            });
+            return;
+        }
         const offset = commons.calculateOffset(pixelXCoordinate, pixelYCoordinate, this.width);
-        this.redisClient.send_command("bitfield",[this.key, 'GET', this.format, offset], redis.print);
+        this.redisClient.send_command("bitfield",[this.keyBuffer, 'GET', this.format, offset], redis.print);
+    }
+
+    /**
+     * Gets the values of multiple pixels in a single round-trip. Each pixel is uniquely specified via its x- and
+     * y-coordinates, which must be specified as 1-based (i.e. the smallest possible value is 1, not 0). The pixels are
+     * read as GET subcommands chained into as few BITFIELD commands as possible.
+     * @param coordinates An array of pixels to get, each specified as an array of its x- and y-coordinates.
+     * @returns {Promise<number[]>} A Promise object containing the numerical value of each pixel, in the same order as
+     * the coordinates. The Promise is rejected if any pixel lies outside of the Canvas, or if Redis returns an error.
+     */
+    getValues(coordinates) {
+        if (coordinates.length === 0) {
+            return Promise.resolve([]);
+        }
+        for (const [x, y] of coordinates) {
+            if (!this.isInCanvas(x, y)) {
+                return Promise.reject(new RangeError("Pixel (" + x + ", " + y + ") is outside of the Canvas."));
+            }
+        }
+        const offsets = this.getOffsetCache();
+        const batch = this.redisClient.batch();
+        for (let i = 0; i < coordinates.length; i += commons.MAXIMUM_SUBCOMMANDS_PER_BITFIELD) {
+            const bitfieldArgs = [this.keyBuffer];
+            for (const [x, y] of coordinates.slice(i, i + commons.MAXIMUM_SUBCOMMANDS_PER_BITFIELD)) {
+                bitfieldArgs.push('GET', this.format, offsets[(y - 1) * this.width + x - 1]);
+            }
+            batch.bitfield(bitfieldArgs);
+        }
+        return this.executeBatch(batch).then((replies) => [].concat(...replies));
     }
 
     /**
@@ -77,9 +156,54 @@ class RedisManager {
      * @return No return value is expected.
      */
     setValue(pixelXCoordinate, pixelYCoordinate, value) {
-        const offset = commons.calculateOffset(pixelXCoordinate, pixelYCoordinate, this.width);
-        this.redisClient.send_command("bitfield",[new Buffer.from(this.key), 'SET', this.format, offset,
-            parseInt(value, 2)]);
+        if (this.bitsPerPixel % 8 === 0) {
+            // Pixels spanning whole bytes are written directly to their byte range, without going through BITFIELD.
+            const byteOffset = ((pixelYCoordinate - 1) * this.width + pixelXCoordinate - 1) * this.bitsPerPixel / 8;
+            this.redisClient.setrange(this.keyBuffer, byteOffset, this.createPixelPattern(parseInt(value, 2)));
+            return;
+        }
+        const offset = this.getOffset(pixelXCoordinate, pixelYCoordinate);
+        this.redisClient.send_command("bitfield", [this.keyBuffer, 'SET', this.format, offset, parseInt(value, 2)]);
+    }
+
+    /**
+     * Checks whether the given coordinates specify a pixel of the Canvas, i.e. both are integers, the x-coordinate is
+     * between 1 and the width of the Canvas, and the y-coordinate is between 1 and the height of the Canvas.
+     * @param pixelXCoordinate The x-coordinate of the pixel, which must be specified as 1-based.
+     * @param pixelYCoordinate The y-coordinate of the pixel, which must be specified as 1-based.
+     * @returns {boolean} Returns true if the pixel lies within the Canvas.
+     */
+    isInCanvas(pixelXCoordinate, pixelYCoordinate) {
+        return Number.isInteger(pixelXCoordinate) && Number.isInteger(pixelYCoordinate) &&
+            pixelXCoordinate >= 1 && pixelXCoordinate <= this.width &&
+            pixelYCoordinate >= 1 && pixelYCoordinate <= this.height;
+    }
+
+    /**
+     * Gets the formatted Redis offset of a given pixel, as returned by commons.calculateOffset, from the offset cache.
+     * Both coordinates should be specified as 1-based (i.e. the smallest possible value is 1, not 0).
+     * @param pixelXCoordinate The x-coordinate of the pixel, which must be specified as 1-based.
+     * @param pixelYCoordinate The y-coordinate of the pixel, which must be specified as 1-based.
+     * @returns {string} Returns a formatted offset string for use in Redis.
+     */
+    getOffset(pixelXCoordinate, pixelYCoordinate) {
+        return this.getOffsetCache()[(pixelYCoordinate - 1) * this.width + pixelXCoordinate - 1];
+    }
+
+    /**
+     * Gets the formatted Redis offsets of every pixel in the Canvas, indexed by the 0-based index of the pixel within
+     * the bitfield. The offsets are only formatted once, the first time they are needed after the Canvas has been
+     * initialized, instead of once per pixel set.
+     * @returns {string[]} The formatted offset string of every pixel in the Canvas.
+     */
+    getOffsetCache() {
+        if (this.offsetCache === null) {
+            this.offsetCache = new Array(this.width * this.height);
+            for (let i = 0; i < this.offsetCache.length; i++) {
+                this.offsetCache[i] = "#" + i;
+            }
+        }
+        return this.offsetCache;
     }
 
     /**
@@ -92,14 +216,223 @@ class RedisManager {
      * @param bottomRightXCoordinate The x-coordinate of the bottom-right pixel, which must be specified as 1-based.
      * @param bottomRightYCoordinate The y-coordinate of the bottom-right pixel, which must be specified as 1-based.
      * @param color The Color to set the pixel to, which must be part of the enumeration of Colors.
+     * @returns {Promise<unknown>} A Promise which resolves once every pixel in the area has been set.
      */
     setAreaValue(topLeftXCoordinate, topLeftYCoordinate, bottomRightXCoordinate, bottomRightYCoordinate, color) {
-        for (let y = topLeftYCoordinate; y < bottomRightYCoordinate + 1; y++) {
-            for (let x = topLeftXCoordinate; x < bottomRightXCoordinate + 1; x++) {
-                this.setValue(x, y, color);
+        const value = parseInt(color, 2);
+        const bitsPerPixel = this.bitsPerPixel;
+        const isByteAligned = this.isByteAligned;
+        const batches = [];
+        let batch = this.redisClient.batch();
+        let queuedCommands = 0;
+        const queueCommand = (command, ...args) => {
+            batch[command](...args);
+            queuedCommands++;
+            if (queuedCommands === commons.MAXIMUM_COMMANDS_PER_BATCH) {
+                batches.push(this.executeBatch(batch));
+                batch = this.redisClient.batch();
+                queuedCommands = 0;
+            }
+        };
+        const offsets = this.getOffsetCache();
+        let packedPixels = null;
+        // Pixels which must be set individually are chained as subcommands of a single BITFIELD command.
+        let bitfieldArgs = [this.keyBuffer];
+        const flushPixels = () => {
+            if (bitfieldArgs.length > 1) {
+                queueCommand('bitfield', bitfieldArgs);
+                bitfieldArgs = [this.keyBuffer];
+            }
+        };
+        const setPixel = (pixelIndex) => {
+            bitfieldArgs.push('SET', this.format, offsets[pixelIndex], value);
+            if (bitfieldArgs.length > 4 * commons.MAXIMUM_SUBCOMMANDS_PER_BITFIELD) {
+                flushPixels();
+            }
+        };
+        // Sets a run of pixels which are contiguous in the bitfield. Every pixel between the first and the last byte
+        // boundary of the run is written with one SETRANGE, and only the pixels sharing a byte with a pixel outside of
+        // the run are set individually.
+        const setContiguousPixels = (firstIndex, lastIndex) => {
+            if (!isByteAligned) {
+                for (let i = firstIndex; i < lastIndex + 1; i++) {
+                    setPixel(i);
+                }
+                return;
+            }
+            let firstAlignedIndex = firstIndex;
+            while (firstAlignedIndex <= lastIndex && firstAlignedIndex * bitsPerPixel % 8 !== 0) {
+                setPixel(firstAlignedIndex);
+                firstAlignedIndex++;
+            }
+            let lastAlignedIndex = lastIndex;
+            while (lastAlignedIndex >= firstAlignedIndex && (lastAlignedIndex + 1) * bitsPerPixel % 8 !== 0) {
+                setPixel(lastAlignedIndex);
+                lastAlignedIndex--;
+            }
+            if (lastAlignedIndex >= firstAlignedIndex) {
+                const pixelCount = lastAlignedIndex - firstAlignedIndex + 1;
+                if (packedPixels === null || packedPixels.length !== pixelCount * bitsPerPixel / 8) {
+                    packedPixels = this.packPixels(pixelCount, value);
+                }
+                queueCommand('setrange', this.keyBuffer, firstAlignedIndex * bitsPerPixel / 8, packedPixels);
+            }
+        };
+
+        // Set the last pixel first so that Redis allocates the bitfield at its final size, instead of growing it
+        // repeatedly as the offsets advance.
+        setPixel((bottomRightYCoordinate - 1) * this.width + bottomRightXCoordinate - 1);
+        flushPixels();
+
+        if (topLeftXCoordinate === 1 && bottomRightXCoordinate === this.width) {
+            // An area spanning the full width of the Canvas is a single contiguous block of the bitfield.
+            setContiguousPixels((topLeftYCoordinate - 1) * this.width, bottomRightYCoordinate * this.width - 1);
+        } else {
+            for (let y = topLeftYCoordinate; y < bottomRightYCoordinate + 1; y++) {
+                const rowStartIndex = (y - 1) * this.width - 1;
+                setContiguousPixels(rowStartIndex + topLeftXCoordinate, rowStartIndex + bottomRightXCoordinate);
+            }
+        }
+        flushPixels();
+        if (queuedCommands > 0) {
+            batches.push(this.executeBatch(batch));
+        }
+        return Promise.all(batches);
+    }
+
+    /**
+     * Sets every pixel of the Canvas to a specified color. Whenever possible, the entire bitfield is packed locally and
+     * written with a single SET, so that Redis allocates it once at its final size. Otherwise (i.e. when the pixel
+     * format is not byte-aligned and the color is not the string of zeroes), the Canvas is set via setAreaValue.
+     * @param color The Color to set the pixels to, which must be part of the enumeration of Colors.
+     * @returns {Promise<unknown>} A Promise which resolves once every pixel in the Canvas has been set.
+     */
+    fill(color) {
+        const value = parseInt(color, 2);
+        if (!this.isByteAligned && value !== 0) {
+            return this.setAreaValue(1, 1, this.width, this.height, color);
+        }
+        const canvasSizeInBytes = Math.ceil(this.width * this.height * this.bitsPerPixel / 8);
+        const canvas = Buffer.alloc(canvasSizeInBytes, value === 0 ? 0 : this.createPixelPattern(value));
+        return new Promise((ok, error) => {
+            this.redisClient.set(this.keyBuffer, canvas, (err, result) => {
+                if (err) {
+                    error(err);
+                } else {
+                    ok(result);
+                }
+            });
+        });
+    }
+
+    /**
+     * Sets a given area of pixels to a specified color atomically, such that no other client can modify any pixel of
+     * the Canvas while the area is being set. The area is set on the Redis server by a Lua script, in a single
+     * round-trip. Since the script blocks every other client while it runs, the Promise is rejected with a RangeError
+     * before anything is sent to Redis, unless both pixels lie within the Canvas and the top-left pixel is above and to
+     * the left of (or equal to) the bottom-right pixel.
+     * @param topLeftXCoordinate The x-coordinate of the top-left pixel, which must be specified as 1-based.
+     * @param topLeftYCoordinate The y-coordinate of the top-left pixel, which must be specified as 1-based.
+     * @param bottomRightXCoordinate The x-coordinate of the bottom-right pixel, which must be specified as 1-based.
+     * @param bottomRightYCoordinate The y-coordinate of the bottom-right pixel, which must be specified as 1-based.
+     * @param color The Color to set the pixel to, which must be part of the enumeration of Colors.
+     * @returns {Promise<unknown>} A Promise which resolves once every pixel in the area has been set.
+     */
+    setAreaValueAtomic(topLeftXCoordinate, topLeftYCoordinate, bottomRightXCoordinate, bottomRightYCoordinate, color) {
+        if (!this.isInCanvas(topLeftXCoordinate, topLeftYCoordinate) ||
+            !this.isInCanvas(bottomRightXCoordinate, bottomRightYCoordinate) ||
+            bottomRightXCoordinate < topLeftXCoordinate || bottomRightYCoordinate < topLeftYCoordinate) {
+            return Promise.reject(new RangeError("Area from (" + topLeftXCoordinate + ", " + topLeftYCoordinate +
+                ") to (" + bottomRightXCoordinate + ", " + bottomRightYCoordinate + ") is not within the Canvas."));
+        }
+        return this.runScript(commons.FILL_AREA_SCRIPT, commons.FILL_AREA_SCRIPT_SHA, [this.keyBuffer],
+            [topLeftXCoordinate, topLeftYCoordinate, bottomRightXCoordinate, bottomRightYCoordinate, this.width,
+                this.format, parseInt(color, 2), commons.MAXIMUM_SUBCOMMANDS_PER_BITFIELD]);
+    }
+
+    /**
+     * Runs a Lua script on the Redis server. The script is first run from the script cache of the server via its SHA1
+     * digest, so that the body of the script is only sent again if the server does not have it cached yet.
+     * @param script The body of the Lua script.
+     * @param sha The SHA1 digest of the body of the Lua script.
+     * @param scriptKeys The keys accessed by the script.
+     * @param scriptArgs The remaining arguments of the script.
+     * @returns {Promise<unknown>} A Promise object containing the value returned by the script.
+     */
+    runScript(script, sha, scriptKeys, scriptArgs) {
+        const args = [scriptKeys.length, ...scriptKeys, ...scriptArgs];
+        return new Promise((ok, error) => {
+            this.redisClient.evalsha(sha, ...args, (err, result) => {
+                if (err && err.code === "NOSCRIPT") {
+                    this.redisClient.eval(script, ...args, (evalErr, evalResult) => {
+                        if (evalErr) {
+                            error(evalErr);
+                        } else {
+                            ok(evalResult);
+                        }
+                    });
+                } else if (err) {
+                    error(err);
+                } else {
+                    ok(result);
+                }
+            });
+        });
+    }
+
+    /**
+     * Packs a run of pixels which all have the same value into the bytes representing them in the bitfield. The run
+     * must start and end on a byte boundary, so the pixel format must be one accepted by createPixelPattern.
+     * @param pixelCount The number of pixels in the run.
+     * @param value The numerical value of each pixel.
+     * @returns {Buffer} A Buffer containing the packed pixels.
+     */
+    packPixels(pixelCount, value) {
+        return Buffer.alloc(pixelCount * this.bitsPerPixel / 8, this.createPixelPattern(value));
+    }
+
+    /**
+     * Creates the smallest whole number of bytes which, when repeated, fills a contiguous run of pixels with a single
+     * value. For pixel formats narrower than a byte, this is one byte holding as many copies of the value as fit in it.
+     * For pixel formats that are a multiple of 8 bits wide, this is the big-endian encoding of the value itself. The
+     * pixel format must fall into one of these two cases.
+     * @param value The numerical value of each pixel.
+     * @returns {Buffer} A Buffer containing the repeating byte pattern.
+     */
+    createPixelPattern(value) {
+        if (this.bitsPerPixel % 8 === 0) {
+            const pattern = Buffer.alloc(this.bitsPerPixel / 8);
+            for (let i = pattern.length - 1; i >= 0; i--) {
+                pattern[i] = value & 0xff;
+                value = Math.floor(value / 256);
             }
+            return pattern;
+        }
+        let byte = 0;
+        for (let bit = 0; bit < 8; bit += this.bitsPerPixel) {
+            byte = (byte << this.bitsPerPixel) | (value & this.pixelMask);
         }
-        // console.log("Set area");
+        return Buffer.from([byte & 0xff]);
+    }
+
+    /**
+     * Sends every command queued on a Redis batch to the server in a single round-trip. Commands in a batch are not
+     * run as a transaction, so the other clients may still be served between them. Since a batch reports the error of
+     * each failed command in its replies instead of failing as a whole, the Promise is rejected with the first of them.
+     * @param batch The batch object (created via redisClient.batch()) containing the queued commands.
+     * @returns {Promise<unknown>} A Promise object containing the replies to each of the queued commands.
+     */
+    executeBatch(batch) {
+        return new Promise((ok, error) => {
+            batch.exec((err, replies) => {
+                const commandError = err || (replies || []).find((reply) => reply instanceof Error);
+                if (commandError) {
+                    error(commandError);
+                } else {
+                    ok(replies);
+                }
+            });
+        });
     }
 
     /**
@@ -113,7 +446,7 @@ class RedisManager {
      */
     getCanvas() {
         return new Promise((ok, error) => {
-            this.redisClient.get(new Buffer.from(this.key), (err, result) => {
+            this.redisClient.get(this.keyBuffer, (err, result) => {
                 let uint8Array = new Uint8Array(result);
                 // let hexString = res.toString('hex');
                 // let binString = hex2bin(hexString);
@@ -126,6 +459,146 @@ class RedisManager {
         }).catch((error) => { console.log(error) });
     }
 
+    /**
+     * Gets the raw bitfield of the Canvas as a Buffer. Unlike getCanvas, the Promise is rejected if Redis returns an
+     * error, so that a failed read is never mistaken for a blank Canvas. A missing key is returned as an empty Buffer,
+     * since Redis treats the pixels of a missing bitfield as zeroes.
+     * @returns {Promise<Buffer>} A Promise object containing the bitfield data.
+     */
+    getBitfield() {
+        return new Promise((ok, error) => {
+            this.redisClient.get(this.keyBuffer, (err, result) => {
+                if (err) {
+                    error(err);
+                } else {
+                    ok(result === null ? Buffer.alloc(0) : result);
+                }
+            });
+        });
+    }
+
+    /**
+     * THIS METHOD SHOULD ONLY BE USED FOR DEBUGGING; IT IS NOT PART OF THE USE CASE.
+     * Gets the entire Canvas as a human-readable string, with one line per row of pixels and the value of each pixel
+     * separated by spaces. The bitfield is fetched from Redis once, and the pixels are unpacked locally.
+     * @returns {Promise<string>} A Promise object containing the string representation of the Canvas.
+     */
+    getCanvasString() {
+        return this.getBitfield().then((bitfield) => {
+            // Each row is collected into the same array and joined once, so no string is built up one pixel at a time.
+            const rows = new Array(this.height);
+            const row = new Array(this.width);
+            for (let y = 0; y < this.height; y++) {
+                for (let x = 0; x < this.width; x++) {
+                    row[x] = this.readPixel(bitfield, y * this.width + x);
+                }
+                rows[y] = row.join(" ");
+            }
+            return rows.join("\n");
+        });
+    }
+
+    /**
+     * Reads the value of a single pixel from a local copy of the bitfield, in the same bit order that Redis uses for
+     * BITFIELD (i.e. the first pixel occupies the most significant bits of the first byte). Bytes beyond the end of the
+     * bitfield are treated as zeroes, as they are by Redis. Pixels of a signed format are decoded as two's complement,
+     * as BITFIELD GET does.
+     * @param bitfield The bitfield data, as a Buffer or Uint8Array.
+     * @param pixelIndex The 0-based index of the pixel within the bitfield.
+     * @returns {number} The numerical value of the pixel.
+     */
+    readPixel(bitfield, pixelIndex) {
+        const bitOffset = pixelIndex * this.bitsPerPixel;
+        let value = 0;
+        if (8 % this.bitsPerPixel === 0) {
+            const byte = bitfield[bitOffset >> 3] || 0;
+            value = (byte >> (8 - this.bitsPerPixel - bitOffset % 8)) & this.pixelMask;
+        } else {
+            for (let bit = bitOffset; bit < bitOffset + this.bitsPerPixel; bit++) {
+                const byte = bitfield[bit >> 3] || 0;
+                value = value * 2 + ((byte >> (7 - bit % 8)) & 1);
+            }
+        }
+        if (this.isSigned && value >= 2 ** (this.bitsPerPixel - 1)) {
+            value -= 2 ** this.bitsPerPixel;
+        }
+        return value;
+    }
+
+    /**
+     * Writes the value of a single pixel to a local copy of the bitfield, in the same bit order that Redis uses for
+     * BITFIELD. The bytes containing the pixel must already exist in the local copy.
+     * @param bitfield The bitfield data, as a Buffer or Uint8Array.
+     * @param pixelIndex The 0-based index of the pixel within the bitfield.
+     * @param value The numerical value of the pixel.
+     */
+    writePixel(bitfield, pixelIndex, value) {
+        const bitOffset = pixelIndex * this.bitsPerPixel;
+        if (8 % this.bitsPerPixel === 0) {
+            const shift = 8 - this.bitsPerPixel - bitOffset % 8;
+            const byteIndex = bitOffset >> 3;
+            const pixelBits = (value & this.pixelMask) << shift;
+            bitfield[byteIndex] = (bitfield[byteIndex] & ~(this.pixelMask << shift)) | pixelBits;
+            return;
+        }
+        for (let bit = bitOffset + this.bitsPerPixel - 1; bit >= bitOffset; bit--) {
+            const mask = 0x80 >> (bit % 8);
+            if (value % 2) {
+                bitfield[bit >> 3] |= mask;
+            } else {
+                bitfield[bit >> 3] &= ~mask;
+            }
+            value = Math.floor(value / 2);
+        }
+    }
+
+    /**
+     * Checks whether every pixel in a given range of rows is white (i.e. the string of zeroes). The check is done on
+     * the Redis server with a single BITCOUNT, without fetching any pixels. Since BITCOUNT counts whole bytes, the
+     * check is only exact when each row starts on a byte boundary; otherwise, pixels sharing a byte with the first or
+     * last row are also checked.
+     * @param topYCoordinate The y-coordinate of the first row, which must be specified as 1-based.
+     * @param bottomYCoordinate The y-coordinate of the last row, which must be specified as 1-based.
+     * @returns {Promise<boolean>} A Promise object containing true if every pixel in the rows is white.
+     */
+    areRowsBlank(topYCoordinate, bottomYCoordinate) {
+        const rowSizeInBits = this.width * this.bitsPerPixel;
+        const startByte = Math.floor((topYCoordinate - 1) * rowSizeInBits / 8);
+        const endByte = Math.ceil(bottomYCoordinate * rowSizeInBits / 8) - 1;
+        return new Promise((ok, error) => {
+            this.redisClient.bitcount(this.keyBuffer, startByte, endByte, (err, result) => {
+                if (err) {
+                    error(err);
+                } else {
+                    ok(result === 0);
+                }
+            });
+        });
+    }
+
+    /**
+     * Finds the first pixel of the Canvas which is not white (i.e. not the string of zeroes), scanning row by row from
+     * the top-left pixel. The search is done on the Redis server with a single BITPOS, without fetching any pixels.
+     * @returns {Promise<number[]|null>} A Promise object containing the 1-based x- and y-coordinates of the pixel, or
+     * null if every pixel of the Canvas is white.
+     */
+    getFirstPaintedPixel() {
+        return new Promise((ok, error) => {
+            this.redisClient.bitpos(this.keyBuffer, 1, (err, result) => {
+                if (err) {
+                    error(err);
+                    return;
+                }
+                const pixelIndex = Math.floor(result / this.bitsPerPixel);
+                if (result === -1 || pixelIndex >= this.width * this.height) {
+                    ok(null);
+                } else {
+                    ok([pixelIndex % this.width + 1, Math.floor(pixelIndex / this.width) + 1]);
+                }
+            });
+        });
+    }
+
     /**
      * Sets the entire Canvas object. This method does not sanitize the input or check that the dimensions are the same
      * as the original initialized values.
@@ -133,10 +606,100 @@ class RedisManager {
      */
     setCanvas(canvas) {
         return new Promise((ok, error) => {
-            this.redisClient.set(new Buffer.from(this.key), canvas);
+            this.redisClient.set(this.keyBuffer, canvas);
+        });
+    }
+
+
+    /**
+     * Loads a local copy of the entire Canvas, which can then be read and modified via getLocalValue and setLocalValue
+     * without a round-trip to Redis per pixel. Modifications to the local copy are only sent to Redis when
+     * flushLocalCanvas is called. This is meant for work which reads or sets many pixels at once; note that flushing
+     * writes whole bytes, so pixels sharing a byte with a modified pixel are also overwritten with their local value.
+     * If the Canvas cannot be read from Redis, the Promise is rejected and no local copy is loaded.
+     * @returns {Promise<unknown>} A Promise which resolves once the local copy has been loaded.
+     */
+    loadLocalCanvas() {
+        return this.getBitfield().then((bitfield) => {
+            const canvasSizeInBytes = Math.ceil(this.width * this.height * this.bitsPerPixel / 8);
+            this.localCanvas = Buffer.alloc(canvasSizeInBytes);
+            this.localCanvas.set(bitfield.subarray(0, canvasSizeInBytes));
+            this.dirtyBytes = new Uint8Array(canvasSizeInBytes);
         });
     }
 
+    /**
+     * Gets the value of a given pixel from the local copy of the Canvas, which must have been loaded via
+     * loadLocalCanvas. Both coordinates should be specified as 1-based (i.e. the smallest possible value is 1, not 0).
+     * @param pixelXCoordinate The x-coordinate of the pixel, which must be specified as 1-based.
+     * @param pixelYCoordinate The y-coordinate of the pixel, which must be specified as 1-based.
+     * @returns {number} The numerical value of the pixel.
+     */
+    getLocalValue(pixelXCoordinate, pixelYCoordinate) {
+        assert(this.localCanvas !== null, "The local canvas has not been loaded.");
+        return this.readPixel(this.localCanvas, (pixelYCoordinate - 1) * this.width + pixelXCoordinate - 1);
+    }
+
+    /**
+     * Sets a given pixel of the local copy of the Canvas to a specified color, which must have been loaded via
+     * loadLocalCanvas. The pixel is only set in Redis once flushLocalCanvas is called. Both coordinates should be
+     * specified as 1-based (i.e. the smallest possible value is 1, not 0).
+     * @param pixelXCoordinate The x-coordinate of the pixel to set, which must be specified as 1-based.
+     * @param pixelYCoordinate The y-coordinate of the pixel to set, which must be specified as 1-based.
+     * @param value The color to set the pixel to, which must be a binary string in the enumeration of Colors.
+     */
+    setLocalValue(pixelXCoordinate, pixelYCoordinate, value) {
+        assert(this.localCanvas !== null, "The local canvas has not been loaded.");
+        const pixelIndex = (pixelYCoordinate - 1) * this.width + pixelXCoordinate - 1;
+        this.writePixel(this.localCanvas, pixelIndex, parseInt(value, 2));
+        const firstBit = pixelIndex * this.bitsPerPixel;
+        this.dirtyBytes.fill(1, firstBit >> 3, ((firstBit + this.bitsPerPixel - 1) >> 3) + 1);
+    }
+
+    /**
+     * Sends every modification made to the local copy of the Canvas to Redis. Each run of consecutive modified bytes is
+     * written with a single SETRANGE, and all of them are pipelined. If any of them fails, the flushed bytes are marked
+     * as modified again, so that they are sent by the next flush.
+     * @returns {Promise<unknown>} A Promise which resolves once every modification has been written.
+     */
+    flushLocalCanvas() {
+        if (this.localCanvas === null) {
+            return Promise.resolve([]);
+        }
+        const batches = [];
+        let batch = this.redisClient.batch();
+        let queuedCommands = 0;
+        const dirtyBytes = this.dirtyBytes;
+        const flushedRuns = [];
+        let runStart = -1;
+        for (let i = 0; i < dirtyBytes.length + 1; i++) {
+            const isDirty = i < dirtyBytes.length && dirtyBytes[i] === 1;
+            if (isDirty && runStart === -1) {
+                runStart = i;
+            } else if (!isDirty && runStart !== -1) {
+                batch.setrange(this.keyBuffer, runStart, Buffer.from(this.localCanvas.subarray(runStart, i)));
+                flushedRuns.push([runStart, i]);
+                runStart = -1;
+                queuedCommands++;
+                if (queuedCommands === commons.MAXIMUM_COMMANDS_PER_BATCH) {
+                    batches.push(this.executeBatch(batch));
+                    batch = this.redisClient.batch();
+                    queuedCommands = 0;
+                }
+            }
+        }
+        if (queuedCommands > 0) {
+            batches.push(this.executeBatch(batch));
+        }
+        // The flushed bytes are unmarked straight away, so that pixels set while the flush is in progress stay marked.
+        dirtyBytes.fill(0);
+        return Promise.all(batches).catch((error) => {
+            for (const [start, end] of flushedRuns) {
+                dirtyBytes.fill(1, start, end);
+            }
+            throw error;
+        });
+    }
 
     /**
      *              ***************************************************************************
@@ -146,7 +709,7 @@ class RedisManager {
      * want to delete the object (e.g. in the course of testing).
      */
     deleteCanvas() {
-        this.redisClient.del(this.key);
+        this.redisClient.del(this.keyBuffer);
     }
 }
 
@@ -1,11 +1,67 @@
+const assert = require("assert");
+const crypto = require("crypto");
 const keys = require("../keys.js");
 
+/**
+ * Defines the configuration of the Redis client. Replies are returned as Buffers, so that the bitfield is passed on
+ * as-is instead of being decoded into a UTF-8 string first. Note that node_redis 3.x always uses its own JavaScript
+ * reply parser (the hiredis parser was removed in that release), so the parser cannot be configured here.
+ */
 const REDIS_CONFIG_FILE = {
     port: keys.redisPort,
     host: keys.redisHost,
     return_buffers: true,
 };
 
+/**
+ * The maximum number of commands queued in a single Redis batch before it is sent to the server. Each batch is sent in
+ * a single round-trip, so this caps the size of the reply buffer held for a batch when a large area is modified.
+ */
+const MAXIMUM_COMMANDS_PER_BATCH = 10000;
+
+/**
+ * The maximum number of GET/SET subcommands chained into a single BITFIELD command.
+ */
+const MAXIMUM_SUBCOMMANDS_PER_BITFIELD = 512;
+
+/**
+ * Lua script which sets a rectangular area of a bitfield to a single value on the Redis server, so that the area is
+ * set atomically and in a single round-trip. The pixels of each row are chained as subcommands of a single BITFIELD
+ * command, and the last pixel is set first so that the bitfield is allocated at its final size. The script takes the
+ * key of the bitfield as its only key, followed by these arguments: the 1-based x- and y-coordinates of the top-left
+ * pixel, the 1-based x- and y-coordinates of the bottom-right pixel, the width of the canvas, the pixel format, the
+ * value of each pixel, and the maximum number of subcommands per BITFIELD command.
+ */
+const FILL_AREA_SCRIPT = `
+local topLeftX, topLeftY = tonumber(ARGV[1]), tonumber(ARGV[2])
+local bottomRightX, bottomRightY = tonumber(ARGV[3]), tonumber(ARGV[4])
+local width, format, value = tonumber(ARGV[5]), ARGV[6], ARGV[7]
+local maximumArguments = 4 * tonumber(ARGV[8])
+redis.call('BITFIELD', KEYS[1], 'SET', format, '#' .. ((bottomRightY - 1) * width + bottomRightX - 1), value)
+for y = topLeftY, bottomRightY do
+    local args = {}
+    for x = topLeftX, bottomRightX do
+        args[#args + 1] = 'SET'
+        args[#args + 1] = format
+        args[#args + 1] = '#' .. ((y - 1) * width + x - 1)
+        args[#args + 1] = value
+        if #args >= maximumArguments then
+            redis.call('BITFIELD', KEYS[1], unpack(args))
+            args = {}
+        end
+    end
+    if #args > 0 then
+        redis.call('BITFIELD', KEYS[1], unpack(args))
+    end
+end
+return 1
+`;
+
+/**
+ * The SHA1 digest of FILL_AREA_SCRIPT, which is used to run the script from the script cache of the Redis server.
+ */
+const FILL_AREA_SCRIPT_SHA = crypto.createHash("sha1").update(FILL_AREA_SCRIPT).digest("hex");
+
 
 /**
  * Defines the retry strategy for the Redis client. A connection will be re-attempted until one of the following
@@ -60,8 +116,26 @@ function calculateOffset(pixelXCoordinate, pixelYCoordinate, canvasWidth) {
     return "#" + totalOffset;
 }
 
+/**
+ * Parses a Redis BITFIELD pixel format (e.g. "u4" for a 4-bit unsigned integer) into its signedness and width.
+ * @param pixelFormat The pixel format to parse, which must be "i" or "u" followed by the number of bits per pixel.
+ * @returns {{isSigned: boolean, bitsPerPixel: number}} Returns whether each pixel is signed, and its width in bits.
+ */
+function parsePixelFormat(pixelFormat) {
+    assert(/^[iu][1-9][0-9]*$/.test(pixelFormat), "Invalid pixel format: " + pixelFormat);
+    return {
+        isSigned: pixelFormat[0] === "i",
+        bitsPerPixel: parseInt(pixelFormat.slice(1), 10)
+    };
+}
+
 module.exports = {
     REDIS_CONFIG_FILE,
     RETRY_STRATEGY_FUNCTION,
-    calculateOffset
+    MAXIMUM_COMMANDS_PER_BATCH,
+    MAXIMUM_SUBCOMMANDS_PER_BITFIELD,
+    FILL_AREA_SCRIPT,
+    FILL_AREA_SCRIPT_SHA,
+    calculateOffset,
+    parsePixelFormat
 };
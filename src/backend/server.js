@@ -46,9 +46,11 @@ const redisManager = new canvas.RedisManager(canvas_commons.CANVAS_NAME);
 // Initialize Database
 if (!keys.databaseDeployed) {
   db.initDatabase();
-  redisManager.initializeBlankCanvas(canvas_commons.CANVAS_WIDTH, canvas_commons.CANVAS_HEIGHT, canvas_commons.PIXEL_FORMAT);
+  redisManager.initializeBlankCanvas(canvas_commons.CANVAS_WIDTH, canvas_commons.CANVAS_HEIGHT, canvas_commons.PIXEL_FORMAT)
+      .catch((error) => { console.log(error) });
 } else {
-  redisManager.initializeBlankCanvas(canvas_commons.CANVAS_WIDTH, canvas_commons.CANVAS_HEIGHT, canvas_commons.PIXEL_FORMAT);
+  redisManager.initializeBlankCanvas(canvas_commons.CANVAS_WIDTH, canvas_commons.CANVAS_HEIGHT, canvas_commons.PIXEL_FORMAT)
+      .catch((error) => { console.log(error) });
   db.getLatestCanvas().then((result) => {
     const bitfield = result["bitfield"];
     redisManager.setCanvas(bitfield).then(() => {
@@ -189,7 +191,9 @@ app.post("/admin/clear", async (req, res) => {
       return;
     }
 
-    await redisManager.setAreaValue(topLeft[0], topLeft[1], bottomRight[0], bottomRight[1], color.ColorBinary.WHITE);
+    await redisManager.setAreaValueAtomic(topLeft[0], topLeft[1], bottomRight[0], bottomRight[1],
+        color.ColorBinary.WHITE);
+    console.log("Cleared area with top-left pixel %j and bottom-right pixel %j", topLeft, bottomRight);
 
     try {
       const grid = await redisManager.getCanvas();
@@ -234,8 +238,8 @@ app.post("/api/grid/:chatId/:userId", async (req, res) => {
     const x_coordinate = req.body.x;
     const y_coordinate = req.body.y;
     redisManager.setValue(x_coordinate, y_coordinate, binaryColorValue);
-    console.log("Set pixel with x-coordinate " + x_coordinate + " and y-coordinate " + y_coordinate +
-        " with binary value " + binaryColorValue);
+    console.log("Set pixel with x-coordinate %s and y-coordinate %s with binary value %s", x_coordinate,
+        y_coordinate, binaryColorValue);
 
     try {
       const grid = await redisManager.getCanvas();
@@ -0,0 +1,566 @@
+const assert = require("assert");
+const crypto = require("crypto");
+const { RedisManager } = require("../redis_js/canvas.js");
+const commons = require("../redis_js/commons.js");
+const color = require("../public/colors.js");
+
+/**
+ * Reads a field of a bitfield in the bit order used by Redis (most significant bit of the first byte first). This is
+ * deliberately independent of RedisManager.readPixel, so that the two can be checked against each other.
+ */
+function readBits(buffer, bitOffset, bitCount, isSigned) {
+  let value = 0;
+  for (let bit = bitOffset; bit < bitOffset + bitCount; bit++) {
+    const byte = buffer[bit >> 3] || 0;
+    value = value * 2 + ((byte >> (7 - bit % 8)) & 1);
+  }
+  if (isSigned && value >= 2 ** (bitCount - 1)) {
+    value -= 2 ** bitCount;
+  }
+  return value;
+}
+
+function writeBits(buffer, bitOffset, bitCount, value) {
+  for (let bit = bitOffset + bitCount - 1; bit >= bitOffset; bit--) {
+    const mask = 0x80 >> (bit % 8);
+    if (((value % 2) + 2) % 2) {
+      buffer[bit >> 3] |= mask;
+    } else {
+      buffer[bit >> 3] &= ~mask;
+    }
+    value = Math.floor(value / 2);
+  }
+}
+
+/**
+ * Creates an in-memory stand-in for a node_redis client, supporting the commands used by RedisManager. Every command
+ * is applied as soon as it is sent (or as soon as its batch is executed), and is recorded in the 'commands' array.
+ */
+function createStubClient() {
+  const store = new Map();
+  const commands = [];
+
+  const getString = (key) => store.get(key.toString()) || Buffer.alloc(0);
+  const growString = (key, size) => {
+    let string = getString(key);
+    if (string.length < size) {
+      const grown = Buffer.alloc(size);
+      string.copy(grown);
+      string = grown;
+    }
+    store.set(key.toString(), string);
+    return string;
+  };
+
+  const handlers = {
+    set: (key, value) => {
+      store.set(key.toString(), Buffer.from(value));
+      return "OK";
+    },
+    get: (key) => (store.has(key.toString()) ? Buffer.from(getString(key)) : null),
+    setrange: (key, offset, value) => {
+      const string = growString(key, offset + value.length);
+      Buffer.from(value).copy(string, offset);
+      return string.length;
+    },
+    getrange: (key, start, end) => getString(key).slice(start, end + 1),
+    bitcount: (key, start, end) => {
+      let count = 0;
+      for (const byte of getString(key).slice(start, end + 1)) {
+        for (let bit = 0; bit < 8; bit++) {
+          count += (byte >> bit) & 1;
+        }
+      }
+      return count;
+    },
+    bitpos: (key, bit) => {
+      const string = getString(key);
+      for (let i = 0; i < string.length * 8; i++) {
+        if (readBits(string, i, 1, false) === bit) {
+          return i;
+        }
+      }
+      return -1;
+    },
+    bitfield: (key, ...args) => {
+      const replies = [];
+      for (let i = 0; i < args.length;) {
+        const format = args[i + 1];
+        const bitCount = parseInt(format.slice(1), 10);
+        const offset = String(args[i + 2]);
+        const bitOffset = offset[0] === "#" ? parseInt(offset.slice(1), 10) * bitCount : parseInt(offset, 10);
+        replies.push(readBits(getString(key), bitOffset, bitCount, format[0] === "i"));
+        if (args[i] === "SET") {
+          writeBits(growString(key, Math.ceil((bitOffset + bitCount) / 8)), bitOffset, bitCount, Number(args[i + 3]));
+          i += 4;
+        } else {
+          i += 3;
+        }
+      }
+      return replies;
+    },
+  };
+
+  const run = (name, args) => {
+    const flatArgs = args.length === 1 && Array.isArray(args[0]) ? args[0] : args;
+    commands.push([name, ...flatArgs]);
+    return handlers[name](...flatArgs);
+  };
+
+  const client = {
+    store,
+    commands,
+    send_command: (name, args, callback) => {
+      const reply = run(name.toLowerCase(), args);
+      if (callback) {
+        process.nextTick(callback, null, reply);
+      }
+    },
+    batch: () => {
+      const queued = [];
+      const batch = {
+        exec: (callback) => {
+          const replies = queued.map(([name, args]) => run(name, args));
+          process.nextTick(callback, null, replies);
+        },
+      };
+      for (const name of Object.keys(handlers)) {
+        batch[name] = (...args) => {
+          queued.push([name, args]);
+          return batch;
+        };
+      }
+      return batch;
+    },
+  };
+  // The Lua scripts are not run; FILL_AREA_SCRIPT is emulated with the BITFIELD commands that it would issue.
+  const scriptCache = new Set();
+  client.scriptCache = scriptCache;
+  const runFillAreaScript = (key, [topLeftX, topLeftY, bottomRightX, bottomRightY, width, format, value]) => {
+    run("bitfield", [key, "SET", format, "#" + ((bottomRightY - 1) * width + bottomRightX - 1), value]);
+    for (let y = topLeftY; y <= bottomRightY; y++) {
+      const args = [key];
+      for (let x = topLeftX; x <= bottomRightX; x++) {
+        args.push("SET", format, "#" + ((y - 1) * width + x - 1), value);
+      }
+      run("bitfield", args);
+    }
+    return 1;
+  };
+  client.evalsha = (sha, keyCount, ...args) => {
+    const callback = args.pop();
+    commands.push(["evalsha", sha, keyCount, ...args]);
+    if (!scriptCache.has(sha)) {
+      const error = new Error("NOSCRIPT No matching script. Please use EVAL.");
+      error.code = "NOSCRIPT";
+      process.nextTick(callback, error);
+      return;
+    }
+    process.nextTick(callback, null, runFillAreaScript(args[0], args.slice(keyCount)));
+  };
+  client.eval = (script, keyCount, ...args) => {
+    const callback = args.pop();
+    commands.push(["eval", keyCount, ...args]);
+    assert.strictEqual(script, commons.FILL_AREA_SCRIPT);
+    scriptCache.add(crypto.createHash("sha1").update(script).digest("hex"));
+    process.nextTick(callback, null, runFillAreaScript(args[0], args.slice(keyCount)));
+  };
+  for (const name of Object.keys(handlers)) {
+    client[name] = (...args) => {
+      const callback = typeof args[args.length - 1] === "function" ? args.pop() : null;
+      const reply = run(name, args);
+      if (callback) {
+        process.nextTick(callback, null, reply);
+      }
+    };
+  }
+  return client;
+}
+
+/**
+ * Creates a RedisManager backed by a stubbed client, holding a blank canvas without any helper lines.
+ */
+function createBlankCanvas(width, height, pixelFormat) {
+  const client = createStubClient();
+  const redisManager = new RedisManager("test canvas", client);
+  redisManager.initializeBlankCanvas(width, height, pixelFormat);
+  redisManager.fill(color.ColorBinary.WHITE);
+  client.commands.length = 0;
+  return { redisManager, client };
+}
+
+function getStoredPixels(client, width, height, bitsPerPixel) {
+  const bitfield = client.store.get("test canvas") || Buffer.alloc(0);
+  const pixels = [];
+  for (let i = 0; i < width * height; i++) {
+    pixels.push(readBits(bitfield, i * bitsPerPixel, bitsPerPixel, false));
+  }
+  return pixels;
+}
+
+describe("parsePixelFormat", () => {
+  it("parses signed and unsigned formats", () => {
+    assert.deepStrictEqual(commons.parsePixelFormat("u4"), { isSigned: false, bitsPerPixel: 4 });
+    assert.deepStrictEqual(commons.parsePixelFormat("i16"), { isSigned: true, bitsPerPixel: 16 });
+  });
+
+  it("rejects invalid formats", () => {
+    for (const pixelFormat of ["x4", "u", "4", "u0", "u-4", "U4", "u4 "]) {
+      assert.throws(() => commons.parsePixelFormat(pixelFormat), assert.AssertionError, pixelFormat);
+    }
+  });
+});
+
+describe("RedisManager.readPixel and RedisManager.writePixel", () => {
+  for (const pixelFormat of ["u1", "u2", "u3", "u4", "u8", "u16", "i4", "i8"]) {
+    it("round-trip " + pixelFormat + " pixels in Redis bit order", () => {
+      const { redisManager } = createBlankCanvas(7, 3, pixelFormat);
+      const bitsPerPixel = redisManager.bitsPerPixel;
+      const bitfield = Buffer.alloc(Math.ceil(21 * bitsPerPixel / 8));
+      const expected = [];
+      for (let i = 0; i < 21; i++) {
+        const value = (i * 7 + 3) % Math.min(2 ** bitsPerPixel, 1000);
+        redisManager.writePixel(bitfield, i, value);
+        expected.push(value);
+      }
+      for (let i = 0; i < 21; i++) {
+        assert.strictEqual(readBits(bitfield, i * bitsPerPixel, bitsPerPixel, false), expected[i]);
+        assert.strictEqual(redisManager.readPixel(bitfield, i),
+            readBits(bitfield, i * bitsPerPixel, bitsPerPixel, redisManager.isSigned));
+      }
+    });
+  }
+
+  it("decodes signed pixels as two's complement", () => {
+    const { redisManager } = createBlankCanvas(2, 1, "i4");
+    const bitfield = Buffer.from([0xf7]);
+    assert.strictEqual(redisManager.readPixel(bitfield, 0), -1);
+    assert.strictEqual(redisManager.readPixel(bitfield, 1), 7);
+  });
+});
+
+describe("RedisManager.setAreaValue", () => {
+  const areas = [
+    [2, 2, 9, 5, "0111"],
+    [3, 4, 3, 7, "0101"],
+    [4, 1, 12, 6, "0110"],
+    [1, 3, 13, 7, "0010"],
+    [13, 7, 13, 7, "1111"],
+  ];
+
+  for (const pixelFormat of ["u1", "u4", "u8", "u16", "u3"]) {
+    it("sets exactly the pixels of each area for " + pixelFormat + " pixels", async () => {
+      const width = 13;
+      const height = 7;
+      const { redisManager, client } = createBlankCanvas(width, height, pixelFormat);
+      const bitsPerPixel = redisManager.bitsPerPixel;
+      const expected = new Array(width * height).fill(0);
+      for (const [topLeftX, topLeftY, bottomRightX, bottomRightY, areaColor] of areas) {
+        await redisManager.setAreaValue(topLeftX, topLeftY, bottomRightX, bottomRightY, areaColor);
+        for (let y = topLeftY; y <= bottomRightY; y++) {
+          for (let x = topLeftX; x <= bottomRightX; x++) {
+            expected[(y - 1) * width + x - 1] = parseInt(areaColor, 2) % 2 ** bitsPerPixel;
+          }
+        }
+        assert.deepStrictEqual(getStoredPixels(client, width, height, bitsPerPixel), expected);
+      }
+    });
+  }
+
+  it("sets unaligned row edges individually and the rest of each row with SETRANGE", async () => {
+    const { redisManager, client } = createBlankCanvas(16, 3, "u4");
+    // Pixels 2 and 11 each share a byte with a pixel outside of the area.
+    await redisManager.setAreaValue(2, 1, 11, 3, "0101");
+    const setranges = client.commands.filter((command) => command[0] === "setrange");
+    assert.strictEqual(setranges.length, 3);
+    for (const [, , offset, value] of setranges) {
+      assert.strictEqual(offset % 8, 1);
+      assert.deepStrictEqual(value, Buffer.from([0x55, 0x55, 0x55, 0x55]));
+    }
+    const expected = [];
+    for (let y = 1; y <= 3; y++) {
+      for (let x = 1; x <= 16; x++) {
+        expected.push(x >= 2 && x <= 11 ? 5 : 0);
+      }
+    }
+    assert.deepStrictEqual(getStoredPixels(client, 16, 3, 4), expected);
+  });
+
+  it("sets an area spanning the full width with a single SETRANGE", async () => {
+    const { redisManager, client } = createBlankCanvas(16, 6, "u4");
+    await redisManager.setAreaValue(1, 2, 16, 5, "0011");
+    const setranges = client.commands.filter((command) => command[0] === "setrange");
+    assert.strictEqual(setranges.length, 1);
+    assert.strictEqual(setranges[0][2], 8);
+    assert.deepStrictEqual(setranges[0][3], Buffer.alloc(32, 0x33));
+    const expected = new Array(96).fill(0).fill(3, 16, 80);
+    assert.deepStrictEqual(getStoredPixels(client, 16, 6, 4), expected);
+  });
+});
+
+describe("RedisManager.setValue and RedisManager.getValue", () => {
+  for (const pixelFormat of ["i8", "i16", "u8", "u16"]) {
+    it("agree with BITFIELD GET for " + pixelFormat + " pixels written via SETRANGE", async () => {
+      const { redisManager, client } = createBlankCanvas(3, 2, pixelFormat);
+      redisManager.setValue(2, 1, "11111111");
+      redisManager.setValue(3, 2, "0101");
+      assert.strictEqual(client.commands.filter((command) => command[0] === "setrange").length, 2);
+
+      const values = await redisManager.getValues([[2, 1], [3, 2], [1, 1]]);
+      assert.deepStrictEqual(values, [pixelFormat === "i8" ? -1 : 255, 5, 0]);
+      assert.deepStrictEqual((await redisManager.getCanvasString()).split(/\s+/).map(Number),
+          [0, values[0], 0, 0, 0, 5]);
+
+      const printed = [];
+      const consoleLog = console.log;
+      console.log = (...args) => printed.push(args.join(" "));
+      try {
+        redisManager.getValue(2, 1);
+        await new Promise((resolve) => setImmediate(resolve));
+      } finally {
+        console.log = consoleLog;
+      }
+      assert.ok(printed.length === 1 && printed[0].endsWith(String(values[0])), printed[0]);
+    });
+  }
+
+  it("reject coordinates which are not pixels of the Canvas without querying Redis", async () => {
+    const { redisManager, client } = createBlankCanvas(3, 2, "u4");
+    for (const coordinates of [[0, 1], [4, 1], [1, 3], [1.5, 1], [1, "2"]]) {
+      await assert.rejects(redisManager.getValues([[1, 1], coordinates]), RangeError, JSON.stringify(coordinates));
+    }
+    assert.deepStrictEqual(client.commands, []);
+  });
+});
+
+describe("RedisManager.setAreaValueAtomic", () => {
+  it("loads the script with EVAL on NOSCRIPT, then runs it from the script cache", async () => {
+    const { redisManager, client } = createBlankCanvas(9, 4, "u4");
+    await redisManager.setAreaValueAtomic(2, 2, 4, 3, "0110");
+    assert.deepStrictEqual(client.commands.map((command) => command[0]).filter((name) => name !== "bitfield"),
+        ["evalsha", "eval"]);
+    assert.strictEqual(client.commands[0][1], commons.FILL_AREA_SCRIPT_SHA);
+
+    client.commands.length = 0;
+    await redisManager.setAreaValueAtomic(9, 4, 9, 4, "0001");
+    assert.deepStrictEqual(client.commands.map((command) => command[0]).filter((name) => name !== "bitfield"),
+        ["evalsha"]);
+
+    const expected = new Array(36).fill(0);
+    expected[10] = expected[11] = expected[12] = expected[19] = expected[20] = expected[21] = 6;
+    expected[35] = 1;
+    assert.deepStrictEqual(getStoredPixels(client, 9, 4, 4), expected);
+  });
+
+  it("rejects areas which are not within the Canvas without sending anything to Redis", async () => {
+    const { redisManager, client } = createBlankCanvas(9, 4, "u4");
+    const areas = [
+      [1, 1, 1e6, 1e6],
+      [0, 1, 2, 2],
+      [1, 1, 10, 4],
+      [1, 1, 9, 5],
+      [1.5, 1, 2, 2],
+      ["1", 1, 2, 2],
+      [3, 3, 2, 2],
+    ];
+    for (const area of areas) {
+      await assert.rejects(redisManager.setAreaValueAtomic(...area, "0000"), RangeError, JSON.stringify(area));
+    }
+    assert.strictEqual(client.commands.length, 0);
+  });
+});
+
+describe("RedisManager.initializeBlankCanvas", () => {
+  it("resolves once the Canvas is blank apart from the helper lines", async () => {
+    const client = createStubClient();
+    const redisManager = new RedisManager("test canvas", client);
+    await redisManager.initializeBlankCanvas(12, 11, "u4");
+    const expected = [];
+    for (let y = 1; y <= 11; y++) {
+      for (let x = 1; x <= 12; x++) {
+        expected.push(x === 10 || y === 10 ? 1 : 0);
+      }
+    }
+    assert.deepStrictEqual(getStoredPixels(client, 12, 11, 4), expected);
+  });
+
+  it("rejects, instead of leaving unhandled rejections, when a command fails", async () => {
+    const client = createStubClient();
+    const createBatch = client.batch;
+    client.batch = () => {
+      const batch = createBatch();
+      batch.exec = (callback) => process.nextTick(callback, null, [new Error("OOM command not allowed")]);
+      return batch;
+    };
+    const unhandledRejections = [];
+    const onUnhandledRejection = (reason) => unhandledRejections.push(reason);
+    process.on("unhandledRejection", onUnhandledRejection);
+    try {
+      const redisManager = new RedisManager("test canvas", client);
+      await assert.rejects(redisManager.initializeBlankCanvas(12, 11, "u4"), /OOM/);
+      await new Promise((resolve) => setImmediate(resolve));
+    } finally {
+      process.removeListener("unhandledRejection", onUnhandledRejection);
+    }
+    assert.deepStrictEqual(unhandledRejections, []);
+  });
+});
+
+describe("RedisManager.fill", () => {
+  const expectedValues = { u4: 11, u16: 11, u3: 3, i4: -5 };
+  for (const pixelFormat of Object.keys(expectedValues)) {
+    it("sets every pixel of a " + pixelFormat + " Canvas to a non-zero Color", async () => {
+      const { redisManager, client } = createBlankCanvas(5, 3, pixelFormat);
+      await redisManager.fill("1011");
+      const setCommands = client.commands.filter((command) => command[0] === "set").length;
+      assert.strictEqual(setCommands, redisManager.isByteAligned ? 1 : 0);
+
+      const coordinates = [];
+      for (let y = 1; y <= 3; y++) {
+        for (let x = 1; x <= 5; x++) {
+          coordinates.push([x, y]);
+        }
+      }
+      const expected = new Array(15).fill(expectedValues[pixelFormat]);
+      assert.deepStrictEqual(await redisManager.getValues(coordinates), expected);
+    });
+  }
+});
+
+describe("RedisManager local canvas", () => {
+  it("loads the Canvas, and treats a missing key as a blank Canvas", async () => {
+    const { redisManager, client } = createBlankCanvas(4, 2, "u4");
+    await redisManager.setAreaValue(2, 1, 3, 2, "0111");
+    await redisManager.loadLocalCanvas();
+    assert.deepStrictEqual([redisManager.getLocalValue(1, 1), redisManager.getLocalValue(2, 1),
+      redisManager.getLocalValue(3, 2), redisManager.getLocalValue(4, 2)], [0, 7, 7, 0]);
+
+    client.store.clear();
+    await redisManager.loadLocalCanvas();
+    assert.strictEqual(redisManager.getLocalValue(2, 1), 0);
+  });
+
+  it("rejects a failed load without loading a local copy", async () => {
+    const { redisManager, client } = createBlankCanvas(4, 1, "u4");
+    client.get = (key, callback) => process.nextTick(callback, new Error("connection lost"));
+    await assert.rejects(redisManager.loadLocalCanvas(), /connection lost/);
+    assert.throws(() => redisManager.setLocalValue(1, 1, "0010"), assert.AssertionError);
+  });
+
+  it("sets pixels locally, and flushes each run of modified bytes with one SETRANGE", async () => {
+    const { redisManager, client } = createBlankCanvas(8, 2, "u4");
+    await redisManager.fill("0111");
+    await redisManager.loadLocalCanvas();
+    // Bytes 0 and 1, byte 3, and bytes 6 and 7 are modified.
+    for (const [x, y] of [[1, 1], [4, 1], [7, 1], [5, 2], [8, 2]]) {
+      redisManager.setLocalValue(x, y, "0010");
+    }
+    assert.strictEqual(redisManager.getLocalValue(4, 1), 2);
+    client.commands.length = 0;
+    await redisManager.flushLocalCanvas();
+    assert.deepStrictEqual(client.commands.map(([name, , offset, value]) => [name, offset, value.length]),
+        [["setrange", 0, 2], ["setrange", 3, 1], ["setrange", 6, 2]]);
+    assert.deepStrictEqual(getStoredPixels(client, 8, 2, 4),
+        [2, 7, 7, 2, 7, 7, 2, 7, 7, 7, 7, 7, 2, 7, 7, 2]);
+
+    client.commands.length = 0;
+    await redisManager.flushLocalCanvas();
+    assert.strictEqual(client.commands.length, 0);
+  });
+
+  it("splits a flush into batches of at most MAXIMUM_COMMANDS_PER_BATCH commands", async () => {
+    const { redisManager, client } = createBlankCanvas(16, 1, "u8");
+    await redisManager.loadLocalCanvas();
+    for (let x = 1; x <= 16; x += 2) {
+      redisManager.setLocalValue(x, 1, "0001");
+    }
+    const batchSizes = [];
+    const createBatch = client.batch;
+    client.batch = () => {
+      const batch = createBatch();
+      const exec = batch.exec;
+      const setrange = batch.setrange;
+      let size = 0;
+      batch.setrange = (...args) => {
+        size++;
+        return setrange(...args);
+      };
+      batch.exec = (callback) => {
+        batchSizes.push(size);
+        exec(callback);
+      };
+      return batch;
+    };
+    const maximumCommandsPerBatch = commons.MAXIMUM_COMMANDS_PER_BATCH;
+    commons.MAXIMUM_COMMANDS_PER_BATCH = 3;
+    try {
+      await redisManager.flushLocalCanvas();
+    } finally {
+      commons.MAXIMUM_COMMANDS_PER_BATCH = maximumCommandsPerBatch;
+    }
+    assert.deepStrictEqual(batchSizes, [3, 3, 2]);
+    assert.deepStrictEqual(getStoredPixels(client, 16, 1, 8), [1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0]);
+  });
+
+  it("keeps the modifications of a failed flush for the next flush", async () => {
+    const { redisManager, client } = createBlankCanvas(4, 1, "u4");
+    await redisManager.fill("0111");
+    await redisManager.loadLocalCanvas();
+    redisManager.setLocalValue(1, 1, "0010");
+
+    const createBatch = client.batch;
+    client.batch = () => {
+      const batch = createBatch();
+      batch.exec = (callback) => process.nextTick(callback, null, [new Error("OOM command not allowed")]);
+      return batch;
+    };
+    await assert.rejects(redisManager.flushLocalCanvas(), /OOM/);
+    assert.deepStrictEqual(getStoredPixels(client, 4, 1, 4), [7, 7, 7, 7]);
+
+    client.batch = createBatch;
+    await redisManager.flushLocalCanvas();
+    assert.deepStrictEqual(getStoredPixels(client, 4, 1, 4), [2, 7, 7, 7]);
+  });
+});
+
+describe("RedisManager.areRowsBlank and RedisManager.getFirstPaintedPixel", () => {
+  it("map the first set bit to the coordinates of its pixel", async () => {
+    const { redisManager } = createBlankCanvas(5, 3, "u4");
+    assert.strictEqual(await redisManager.getFirstPaintedPixel(), null);
+    // Only the least significant bit of pixel (3, 2) is set, which is the last of its four bits.
+    redisManager.setValue(3, 2, "0001");
+    redisManager.setValue(4, 3, "1000");
+    assert.deepStrictEqual(await redisManager.getFirstPaintedPixel(), [3, 2]);
+    redisManager.setValue(5, 1, "1000");
+    assert.deepStrictEqual(await redisManager.getFirstPaintedPixel(), [5, 1]);
+  });
+
+  it("ignore the padding bits beyond the last pixel", async () => {
+    const { redisManager, client } = createBlankCanvas(3, 1, "u4");
+    client.store.set("test canvas", Buffer.from([0x00, 0x0f]));
+    assert.strictEqual(await redisManager.getFirstPaintedPixel(), null);
+  });
+
+  it("treat a missing key as a blank Canvas", async () => {
+    const { redisManager, client } = createBlankCanvas(3, 2, "u4");
+    client.store.clear();
+    assert.strictEqual(await redisManager.getFirstPaintedPixel(), null);
+    assert.strictEqual(await redisManager.areRowsBlank(1, 2), true);
+  });
+
+  it("count the whole bytes covering the rows, for a width which is not byte-aligned", async () => {
+    // Each row of three u4 pixels is 12 bits long, so row 2 starts in the middle of byte 1.
+    const { redisManager, client } = createBlankCanvas(3, 4, "u4");
+    assert.strictEqual(await redisManager.areRowsBlank(2, 3), true);
+    assert.deepStrictEqual(client.commands[0].slice(2), [1, 4]);
+
+    redisManager.setValue(1, 1, "0100");
+    assert.strictEqual(await redisManager.areRowsBlank(2, 2), true);
+    redisManager.setValue(3, 1, "0100");
+    assert.strictEqual(await redisManager.areRowsBlank(2, 2), false);
+    assert.strictEqual(await redisManager.areRowsBlank(3, 4), true);
+    redisManager.setValue(2, 4, "0001");
+    assert.strictEqual(await redisManager.areRowsBlank(3, 4), false);
+    assert.strictEqual(await redisManager.areRowsBlank(1, 4), false);
+  });
+});